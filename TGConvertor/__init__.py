@@ -1,4 +1,10 @@
 from .manager import SessionManager
-from .manager import PyroSession, TeleSession, TDataSession
+from . import manager as _manager
 
-__all__ = ["SessionManager", "PyroSession", "TeleSession", "TDataSession"]
\ No newline at end of file
+__all__ = ["SessionManager", "PyroSession", "TeleSession", "TDataSession"]
+
+
+def __getattr__(name: str):
+    if name in _manager._SESSIONS:
+        return getattr(_manager, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
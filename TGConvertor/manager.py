@@ -1,12 +1,52 @@
+import asyncio
+import importlib
+from functools import cached_property
 from pathlib import Path
-from typing import Type, Union
+from typing import TYPE_CHECKING, Type, Union
 from opentele.api import API, APIData
-from .sessions.pyro import PyroSession
-from .sessions.tele import TeleSession
-from .sessions.tdata import TDataSession
 from .exceptions import ValidationError
 
+if TYPE_CHECKING:
+    from .sessions.pyro import PyroSession
+    from .sessions.tele import TeleSession
+    from .sessions.tdata import TDataSession
+
+__all__ = ["SessionManager", "PyroSession", "TeleSession", "TDataSession"]
+
+_SESSIONS = {
+    "PyroSession": ".sessions.pyro",
+    "TeleSession": ".sessions.tele",
+    "TDataSession": ".sessions.tdata",
+}
+
+
+def __getattr__(name: str):
+    """
+    Lazily imports session backends so that only the formats in use are loaded.
+    """
+    if name not in _SESSIONS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(_SESSIONS[name], __package__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
 class SessionManager:
+    # __dict__ is kept for the cached_property attributes below.
+    __slots__ = (
+        "dc_id", "auth_key", "user_id", "valid", "api", "user", "client",
+        "_contexts", "_context_opened", "_client_lock", "__dict__",
+    )
+    # Cached attributes to drop when the field they are built from changes.
+    _DEPENDENT_CACHES = {
+        "dc_id": ("pyrogram", "telethon", "tdata"),
+        "auth_key": ("auth_key_hex", "pyrogram", "telethon", "tdata"),
+        "user_id": ("pyrogram", "tdata"),
+        "api": ("tdata",),
+    }
+
     def __init__(
         self,
         dc_id: int,
@@ -33,25 +73,71 @@ class SessionManager:
         self.api = api.copy()
         self.user = None
         self.client = None
+        # Number of async with blocks using the client, and whether one of
+        # them opened it (rather than an explicit open()).
+        self._contexts = 0
+        self._context_opened = False
+        self._client_lock = asyncio.Lock()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+        for cached in self._DEPENDENT_CACHES.get(name, ()):
+            self.__dict__.pop(cached, None)
 
     async def __aenter__(self):
         """
         Asynchronous context manager entry method.
+        Connects the Telethon client, reusing it if it is already open.
+        Contexts may overlap, including from different tasks.
+        """
+        async with self._client_lock:
+            opened = self.client is None
+            client = await self.open()
+            self._context_opened = self._context_opened or opened
+            self._contexts += 1
+        return client
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Asynchronous context manager exit method.
+        Disconnects the Telethon client when the last context exits, if a
+        context opened it; a client from an explicit open() stays connected.
+        """
+        async with self._client_lock:
+            self._contexts -= 1
+            if self._contexts == 0 and self._context_opened:
+                self._context_opened = False
+                await self.close()
+
+    async def open(self):
+        """
         Establishes a connection to the Telethon client.
+        The client is kept on the instance and reused until close() is called.
+
+        Returns:
+            Telethon client instance.
         """
-        self.client = self.telethon_client()
-        await self.client.connect()
+        if self.client is None:
+            self.client = self.telethon_client()
+        if not self.client.is_connected():
+            try:
+                await self.client.connect()
+            except BaseException:
+                # Drop the client so that the next open() starts afresh and
+                # the caller that opens it is the one that closes it.
+                await self.close()
+                raise
         return self.client
 
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
+    async def close(self):
         """
-        Asynchronous context manager exit method.
-        Disconnects the Telethon client.
+        Disconnects the Telethon client opened by open().
         """
-        await self.client.disconnect()
-        self.client = None
+        if self.client is not None:
+            await self.client.disconnect()
+            self.client = None
 
-    @property
+    @cached_property
     def auth_key_hex(self) -> str:
         """
         Returns the hexadecimal representation of the authentication key.
@@ -70,6 +156,8 @@ class SessionManager:
         Returns:
             SessionManager: An instance initialized from the Telethon file.
         """
+        from .sessions.tele import TeleSession
+
         session = await TeleSession.from_file(file)
         return cls(
             dc_id=session.dc_id,
@@ -89,6 +177,8 @@ class SessionManager:
         Returns:
             SessionManager: An instance initialized from the Telethon string.
         """
+        from .sessions.tele import TeleSession
+
         session = TeleSession.from_string(string)
         return cls(
             dc_id=session.dc_id,
@@ -108,6 +198,8 @@ class SessionManager:
         Returns:
             SessionManager: An instance initialized from the Pyrogram file.
         """
+        from .sessions.pyro import PyroSession
+
         session = await PyroSession.from_file(file)
         return cls(
             auth_key=session.auth_key,
@@ -128,6 +220,8 @@ class SessionManager:
         Returns:
             SessionManager: An instance initialized from the Pyrogram string.
         """
+        from .sessions.pyro import PyroSession
+
         session = PyroSession.from_string(string)
         return cls(
             auth_key=session.auth_key,
@@ -147,6 +241,8 @@ class SessionManager:
         Returns:
             SessionManager: An instance initialized from the TData session folder.
         """
+        from .sessions.tdata import TDataSession
+
         session = TDataSession.from_tdata(folder)
         return cls(
             auth_key=session.auth_key,
@@ -154,6 +250,20 @@ class SessionManager:
             api=session.api
         )
 
+    @classmethod
+    async def afrom_tdata_folder(cls, folder: Union[Path, str]):
+        """
+        Creates a SessionManager instance from a TData session folder
+        without blocking the event loop.
+
+        Args:
+            folder (Union[Path, str]): Path to the TData session folder.
+
+        Returns:
+            SessionManager: An instance initialized from the TData session folder.
+        """
+        return await asyncio.to_thread(cls.from_tdata_folder, folder)
+
     async def to_pyrogram_file(self, path: Union[Path, str]):
         """
         Saves the current session as a Pyrogram file.
@@ -198,34 +308,40 @@ class SessionManager:
             path (Union[Path, str]): Path to save the TData session folder.
         """
         await self.get_user_id()
-        self.tdata.to_folder(path)
+        await asyncio.to_thread(self.tdata.to_folder, path)
 
-    @property
-    def pyrogram(self) -> PyroSession:
+    @cached_property
+    def pyrogram(self) -> "PyroSession":
         """
         Returns a PyroSession instance representing the current session.
         """
+        from .sessions.pyro import PyroSession
+
         return PyroSession(
             dc_id=self.dc_id,
             auth_key=self.auth_key,
             user_id=self.user_id,
         )
 
-    @property
-    def telethon(self) -> TeleSession:
+    @cached_property
+    def telethon(self) -> "TeleSession":
         """
         Returns a TeleSession instance representing the current session.
         """
+        from .sessions.tele import TeleSession
+
         return TeleSession(
             dc_id=self.dc_id,
             auth_key=self.auth_key,
         )
 
-    @property
-    def tdata(self) -> TDataSession:
+    @cached_property
+    def tdata(self) -> "TDataSession":
         """
         Returns a TDataSession instance representing the current session.
         """
+        from .sessions.tdata import TDataSession
+
         return TDataSession(
             dc_id=self.dc_id,
             auth_key=self.auth_key,
@@ -290,7 +406,7 @@ class SessionManager:
         Raises:
             ValidationError: If the user is not available.
         """
-        if self.user_id:
+        if self.user_id is not None:
             return self.user_id
 
         user = await self.get_user()
@@ -0,0 +1,64 @@
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Union
+
+from ..exceptions import ValidationError
+
+# (table, column) pairs of every table in the database, in one query.
+TABLE_COLUMNS = (
+    "SELECT m.name, p.name FROM sqlite_master AS m "
+    "JOIN pragma_table_info(m.name) AS p WHERE m.type = 'table'"
+)
+
+# A file created by the write itself needs neither a rollback journal nor
+# fsyncs: if the write fails, there is nothing to recover. BEGIN is left
+# running so that the schema and the inserts that follow are stored by a
+# single commit.
+NEW_FILE_PREFIX = "PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF; BEGIN;"
+
+
+def schema_script(path: Union[Path, str], schema: str) -> str:
+    # Must run before connecting, which creates the file. A path that already
+    # exists may hold a live database, so it keeps its journal and a failed
+    # write is rolled back instead of leaving the file half-written.
+    if os.path.exists(path):
+        return "BEGIN;" + schema
+    return NEW_FILE_PREFIX + schema
+
+
+def connect_readonly(path: Union[Path, str]) -> sqlite3.Connection:
+    # mode=ro never creates a missing file and never takes a write lock.
+    return sqlite3.connect(Path(path).absolute().as_uri() + "?mode=ro", uri=True)
+
+
+def load_session_row(
+    path: Union[Path, str],
+    validate_db: Callable[[sqlite3.Connection], bool],
+) -> sqlite3.Row:
+    try:
+        with closing(connect_readonly(path)) as db:
+            if not validate_db(db):
+                raise ValidationError()
+
+            db.row_factory = sqlite3.Row
+            row = db.execute("SELECT * FROM sessions").fetchone()
+    except sqlite3.DatabaseError:
+        raise ValidationError()
+
+    if row is None:
+        raise ValidationError()
+
+    return row
+
+
+def validate_file(
+    path: Union[Path, str],
+    validate_db: Callable[[sqlite3.Connection], bool],
+) -> bool:
+    try:
+        with closing(connect_readonly(path)) as db:
+            return validate_db(db)
+    except sqlite3.DatabaseError:
+        return False
@@ -1,14 +1,33 @@
-import base64
-import secrets
+import asyncio
+import itertools
+import os
+import sqlite3
 import struct
-from typing import Type, Union
+from contextlib import closing
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Type, Union
 from pathlib import Path
 
-import aiosqlite
-from opentele.api import APIData
-from pyrogram.client import Client
+from ._sqlite import (
+    TABLE_COLUMNS,
+    load_session_row,
+    schema_script,
+    validate_file,
+)
 
-from ..exceptions import ValidationError
+try:
+    from pybase64 import urlsafe_b64decode, urlsafe_b64encode
+except ImportError:
+    from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+if TYPE_CHECKING:
+    from opentele.api import APIData
+    from pyrogram.client import Client
+
+# Client names only need to be unique within the process; the session
+# itself is kept in memory, so no file is ever created under this name.
+_PID = os.getpid()
+_COUNTER = itertools.count()
 
 
 SCHEMA = """
@@ -50,56 +69,50 @@ END;
 """
 
 
+@dataclass(slots=True, kw_only=True, eq=False)
 class PyroSession:
     OLD_STRING_FORMAT = ">B?256sI?"
     OLD_STRING_FORMAT_64 = ">B?256sQ?"
     STRING_SIZE = 351
     STRING_SIZE_64 = 356
     STRING_FORMAT = ">BI?256sQ?"
+    SCHEMA_VERSION = 3
+    _OLD_STRUCT = struct.Struct(OLD_STRING_FORMAT)
+    _OLD_STRUCT_64 = struct.Struct(OLD_STRING_FORMAT_64)
+    _STRUCT = struct.Struct(STRING_FORMAT)
+    # Old-format strings are told apart by their length alone.
+    _OLD_STRUCTS = {STRING_SIZE: _OLD_STRUCT, STRING_SIZE_64: _OLD_STRUCT_64}
+    # Base64 padding to restore, indexed by the unpadded length modulo 4.
+    _PAD = (b"", b"===", b"==", b"=")
+    # Length of an encoded _STRUCT with the padding left off.
+    _STRING_LENGTH = (4 * _STRUCT.size + 2) // 3
     TABLES = {
         "sessions": {"dc_id", "test_mode", "auth_key", "date", "user_id", "is_bot"},
         "peers": {"id", "access_hash", "type", "username", "phone_number", "last_update_on"},
         "version": {"number"}
     }
 
-    def __init__(
-        self,
-        *,
-        dc_id: int,
-        auth_key: bytes,
-        user_id: None | int = None,
-        is_bot: bool = False,
-        test_mode: bool = False,
-        api_id: None | int = None,
-    ):
-        self.dc_id = dc_id
-        self.auth_key = auth_key
-        self.user_id = user_id
-        self.is_bot = is_bot
-        self.test_mode = test_mode
-        self.api_id = api_id
+    dc_id: int
+    auth_key: bytes = field(repr=False)
+    user_id: None | int = None
+    is_bot: bool = False
+    test_mode: bool = False
+    api_id: None | int = None
 
     @classmethod
     def from_string(cls, session_string: str):
-        if len(session_string) in [cls.STRING_SIZE, cls.STRING_SIZE_64]:
-            string_format = cls.OLD_STRING_FORMAT_64
-
-            if len(session_string) == cls.STRING_SIZE:
-                string_format = cls.OLD_STRING_FORMAT
+        raw = session_string.encode("ascii")
+        decoded = urlsafe_b64decode(raw + cls._PAD[len(raw) & 3])
+        string_struct = cls._OLD_STRUCTS.get(len(raw))
 
+        if string_struct is not None:
             api_id = None
-            dc_id, test_mode, auth_key, user_id, is_bot = struct.unpack(
-                string_format,
-                base64.urlsafe_b64decode(
-                    session_string + "=" * (-len(session_string) % 4)
-                )
+            dc_id, test_mode, auth_key, user_id, is_bot = string_struct.unpack(
+                decoded
             )
         else:
-            dc_id, api_id, test_mode, auth_key, user_id, is_bot = struct.unpack(
-                cls.STRING_FORMAT,
-                base64.urlsafe_b64decode(
-                    session_string + "=" * (-len(session_string) % 4)
-                )
+            dc_id, api_id, test_mode, auth_key, user_id, is_bot = cls._STRUCT.unpack(
+                decoded
             )
 
         return cls(
@@ -113,50 +126,45 @@ class PyroSession:
 
     @classmethod
     async def from_file(cls, path: Union[Path, str]):
-        if not await cls.validate(path):
-            raise ValidationError()
-
-        async with aiosqlite.connect(path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM sessions") as cursor:
-                session = await cursor.fetchone()
+        row = await asyncio.to_thread(load_session_row, path, cls._validate_db)
 
-        return cls(**session)
+        return cls(
+            dc_id=row["dc_id"],
+            auth_key=row["auth_key"],
+            user_id=row["user_id"],
+            is_bot=bool(row["is_bot"]),
+            test_mode=bool(row["test_mode"]),
+            api_id=row["api_id"] if "api_id" in row.keys() else None,
+        )
 
     @classmethod
     async def validate(cls, path: Union[Path, str]) -> bool:
-        try:
-            async with aiosqlite.connect(path) as db:
-                db.row_factory = aiosqlite.Row
-                sql = "SELECT name FROM sqlite_master WHERE type='table'"
-                async with db.execute(sql) as cursor:
-                    tables = {row["name"] for row in await cursor.fetchall()}
-
-                if tables != set(cls.TABLES.keys()):
-                    return False
-
-                for table, session_columns in cls.TABLES.items():
-                    sql = f'pragma table_info("{table}")'
-                    async with db.execute(sql) as cur:
-                        columns = {row["name"] for row in await cur.fetchall()}
-                        if "api_id" in columns:
-                            columns.remove("api_id")
-                        if session_columns != columns:
-                            return False
-
-        except aiosqlite.DatabaseError:
-            return False
-
-        return True
+        return await asyncio.to_thread(validate_file, path, cls._validate_db)
+
+    @classmethod
+    def _validate_db(cls, db: sqlite3.Connection) -> bool:
+        tables = {}
+        for table, column in db.execute(TABLE_COLUMNS):
+            columns = tables.setdefault(table, set())
+            # api_id only exists in files written by newer Pyrogram versions.
+            if column == "api_id":
+                continue
+            if column not in cls.TABLES.get(table, ()):
+                return False
+            columns.add(column)
+
+        return tables == cls.TABLES
 
     def client(
         self,
-        api: Type[APIData],
+        api: Type["APIData"],
         proxy: None | dict = None,
         no_updates: bool = True
-    ) -> Client:
+    ) -> "Client":
+        from pyrogram.client import Client
+
         client = Client(
-            name=secrets.token_urlsafe(8),
+            name=f"s{_PID}_{next(_COUNTER)}",
             api_id=api.api_id,
             api_hash=api.api_hash,
             app_version=api.app_version,
@@ -171,8 +179,7 @@ class PyroSession:
         return client
 
     def to_string(self) -> str:
-        packed = struct.pack(
-            self.STRING_FORMAT,
+        packed = self._STRUCT.pack(
             self.dc_id,
             self.api_id or 0,
             self.test_mode,
@@ -180,12 +187,16 @@ class PyroSession:
             self.user_id or 9999,
             self.is_bot
         )
-        return base64.urlsafe_b64encode(packed).decode().rstrip("=")
+        encoded = urlsafe_b64encode(packed)
+        return encoded[:self._STRING_LENGTH].decode("ascii")
 
     async def to_file(self, path: Union[Path, str]):
-        async with aiosqlite.connect(path) as db:
-            await db.executescript(SCHEMA)
-            await db.commit()
+        await asyncio.to_thread(self._write_file, path)
+
+    def _write_file(self, path: Union[Path, str]):
+        script = schema_script(path, SCHEMA)
+        with closing(sqlite3.connect(path)) as db:
+            db.executescript(script)
             sql = "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?)"
             params = (
                 self.dc_id,
@@ -196,5 +207,7 @@ class PyroSession:
                 self.user_id or 9999,
                 self.is_bot
             )
-            await db.execute(sql, params)
-            await db.commit()
+            db.execute(sql, params)
+            sql = "INSERT INTO version VALUES (?)"
+            db.execute(sql, (self.SCHEMA_VERSION,))
+            db.commit()
@@ -1,3 +1,5 @@
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Type, Union
 
@@ -6,23 +8,17 @@ from opentele.td import TDesktop, Account, AuthKeyType, AuthKey
 from opentele.td.configs import DcId
 
 
+@dataclass(slots=True, kw_only=True, eq=False)
 class TDataSession:
-    def __init__(
-            self,
-            *,
-            dc_id: int,
-            auth_key: bytes,
-            user_id: int,
-            api: Type[APIData] = API.TelegramDesktop,
-    ):
-        self.dc_id = dc_id
-        self.auth_key = auth_key
-        self.user_id = user_id
-        self.api = api
+    dc_id: int
+    auth_key: bytes = field(repr=False)
+    user_id: int
+    api: Type[APIData] = API.TelegramDesktop
 
     @classmethod
     def from_tdata(cls, tdata_folder: Union[Path, str]):
-        if not tdata_folder.exists():
+        tdata_folder = os.fspath(tdata_folder)
+        if not os.path.isdir(tdata_folder):
             raise FileNotFoundError(tdata_folder)
 
         client = TDesktop(basePath=tdata_folder)
@@ -35,7 +31,8 @@ class TDataSession:
         )
 
     def to_folder(self, path: Union[Path, str]):
-        path.mkdir(parents=True, exist_ok=True)
+        path = os.fspath(path)
+        os.makedirs(path, exist_ok=True)
 
         dc_id = DcId(self.dc_id)
         auth_key = AuthKey(self.auth_key, AuthKeyType.ReadFromFile, dc_id)
@@ -49,5 +46,5 @@ class TDataSession:
         account._setMtpAuthorizationCustom(dc_id, self.user_id, [auth_key])
         client._addSingleAccount(account)
 
-        client.SaveTData(path / "tdata")
+        client.SaveTData(os.path.join(path, "tdata"))
         
\ No newline at end of file
@@ -1,16 +1,27 @@
-import base64
-import ipaddress
+import asyncio
+import socket
+import sqlite3
 import struct
+from contextlib import closing
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Type
+from typing import TYPE_CHECKING, Type
 
-import aiosqlite
-from opentele.api import APIData
-from pyrogram.session.internals.data_center import DataCenter
-from telethon import TelegramClient
-from telethon.sessions import StringSession
+from ._sqlite import (
+    TABLE_COLUMNS,
+    load_session_row,
+    schema_script,
+    validate_file,
+)
 
-from ..exceptions import ValidationError
+if TYPE_CHECKING:
+    from opentele.api import APIData
+    from telethon import TelegramClient
+
+try:
+    from pybase64 import urlsafe_b64decode, urlsafe_b64encode
+except ImportError:
+    from base64 import urlsafe_b64decode, urlsafe_b64encode
 
 
 SCHEMA = """
@@ -52,9 +63,25 @@ CREATE TABLE update_state (
 """
 
 
+@dataclass(slots=True, kw_only=True, eq=False)
 class TeleSession:
     _STRUCT_PREFORMAT = '>B{}sH256s'
+    _STRUCT_IPV4 = struct.Struct(_STRUCT_PREFORMAT.format(4))
+    _STRUCT_IPV6 = struct.Struct(_STRUCT_PREFORMAT.format(16))
+    # Copy of pyrogram.session.internals.data_center.DataCenter.PROD, with the
+    # port DataCenter returns for it; tests check that the two stay equal.
+    # Kept here so that loading this module never imports pyrogram, which
+    # fails when its first import happens in a thread without an event loop.
+    _DC_ADDRESSES = {
+        1: ("149.154.175.53", 443),
+        2: ("149.154.167.51", 443),
+        3: ("149.154.175.100", 443),
+        4: ("149.154.167.91", 443),
+        5: ("91.108.56.130", 443),
+        203: ("91.105.192.100", 443),
+    }
     CURRENT_VERSION = '1'
+    SCHEMA_VERSION = 7
     TABLES = {
         "sessions": {
             "dc_id", "server_address", "port", "auth_key", "takeout_id"
@@ -65,29 +92,21 @@ class TeleSession:
         "version": {"version"},
     }
 
-    def __init__(
-        self,
-        *,
-        dc_id: int,
-        auth_key: bytes,
-        server_address: None | str = None,
-        port: None | int = None,
-        takeout_id: None | int = None
-    ):
-        self.dc_id = dc_id
-        self.auth_key = auth_key
-        self.server_address = server_address
-        self.port = port
-        self.takeout_id = takeout_id
+    dc_id: int
+    auth_key: bytes = field(repr=False)
+    server_address: None | str = None
+    port: None | int = None
+    takeout_id: None | int = None
 
     @classmethod
     def from_string(cls, string: str):
         string = string[1:]
-        ip_len = 4 if len(string) == 352 else 16
-        dc_id, ip, port, auth_key = struct.unpack(
-            cls._STRUCT_PREFORMAT.format(ip_len), cls.decode(string)
-        )
-        server_address = ipaddress.ip_address(ip).compressed
+        if len(string) == 352:
+            dc_id, ip, port, auth_key = cls._STRUCT_IPV4.unpack(cls.decode(string))
+            server_address = "%d.%d.%d.%d" % tuple(ip)
+        else:
+            dc_id, ip, port, auth_key = cls._STRUCT_IPV6.unpack(cls.decode(string))
+            server_address = socket.inet_ntop(socket.AF_INET6, ip)
         return cls(
             auth_key=auth_key,
             dc_id=dc_id,
@@ -97,54 +116,47 @@ class TeleSession:
 
     @classmethod
     async def from_file(cls, path: Path):
-        if not await cls.validate(path):
-            raise ValidationError()
-
-        async with aiosqlite.connect(path) as db:
-            db.row_factory = aiosqlite.Row
-            async with db.execute("SELECT * FROM sessions") as cursor:
-                session = await cursor.fetchone()
+        row = await asyncio.to_thread(load_session_row, path, cls._validate_db)
 
-        return cls(**session)
+        return cls(
+            dc_id=row["dc_id"],
+            auth_key=row["auth_key"],
+            server_address=row["server_address"],
+            port=row["port"],
+            takeout_id=row["takeout_id"],
+        )
 
     @classmethod
     async def validate(cls, path: Path) -> bool:
-        try:
-            async with aiosqlite.connect(path) as db:
-                db.row_factory = aiosqlite.Row
-                sql = "SELECT name FROM sqlite_master WHERE type='table'"
-                async with db.execute(sql) as cursor:
-                    tables = {row["name"] for row in await cursor.fetchall()}
-
-                if tables != set(cls.TABLES.keys()):
-                    return False
+        return await asyncio.to_thread(validate_file, path, cls._validate_db)
 
-                for table, session_columns in cls.TABLES.items():
-                    sql = f'pragma table_info("{table}")'
-                    async with db.execute(sql) as cur:
-                        columns = {row["name"] for row in await cur.fetchall()}
-                        if session_columns != columns:
-                            return False
-
-        except aiosqlite.DatabaseError:
-            return False
+    @classmethod
+    def _validate_db(cls, db: sqlite3.Connection) -> bool:
+        tables = {}
+        for table, column in db.execute(TABLE_COLUMNS):
+            if column not in cls.TABLES.get(table, ()):
+                return False
+            tables.setdefault(table, set()).add(column)
 
-        return True
+        return tables == cls.TABLES
 
     @staticmethod
     def encode(x: bytes) -> str:
-        return base64.urlsafe_b64encode(x).decode('ascii')
+        return urlsafe_b64encode(x).decode('ascii')
 
     @staticmethod
     def decode(x: str) -> bytes:
-        return base64.urlsafe_b64decode(x)
+        return urlsafe_b64decode(x)
 
     def client(
         self,
-        api: Type[APIData],
+        api: Type["APIData"],
         proxy: None | dict = None,
         no_updates: bool = True
-    ):
+    ) -> "TelegramClient":
+        from telethon import TelegramClient
+        from telethon.sessions import StringSession
+
         client = TelegramClient(
             session=StringSession(self.to_string()),
             api_id=api.api_id,
@@ -160,23 +172,33 @@ class TeleSession:
         return client
 
     def to_string(self) -> str:
+        return self.to_bytes().decode('ascii')
+
+    def _ensure_dc_defaults(self):
         if self.server_address is None:
-            self.server_address, self.port = DataCenter(
-                self.dc_id, False, False, False
-            )
-        ip = ipaddress.ip_address(self.server_address).packed
-        return self.CURRENT_VERSION + self.encode(struct.pack(
-            self._STRUCT_PREFORMAT.format(len(ip)),
-            self.dc_id,
-            ip,
-            self.port,
-            self.auth_key
-        ))
+            self.server_address, self.port = self._DC_ADDRESSES[self.dc_id]
+
+    def to_bytes(self) -> bytes:
+        self._ensure_dc_defaults()
+        try:
+            ip = socket.inet_pton(socket.AF_INET, self.server_address)
+        except OSError:
+            ip = socket.inet_pton(socket.AF_INET6, self.server_address)
+        string_struct = self._STRUCT_IPV4 if len(ip) == 4 else self._STRUCT_IPV6
+        return self.CURRENT_VERSION.encode('ascii') + urlsafe_b64encode(
+            string_struct.pack(self.dc_id, ip, self.port, self.auth_key)
+        )
 
     async def to_file(self, path: Path):
-        async with aiosqlite.connect(path) as db:
-            await db.executescript(SCHEMA)
-            await db.commit()
+        await asyncio.to_thread(self._write_file, path)
+
+    def _write_file(self, path: Path):
+        self._ensure_dc_defaults()
+        script = schema_script(path, SCHEMA)
+        with closing(sqlite3.connect(path)) as db:
+            db.executescript(script)
+            sql = "INSERT INTO version VALUES (?)"
+            db.execute(sql, (self.SCHEMA_VERSION,))
             sql = "INSERT INTO sessions VALUES (?, ?, ?, ?, ?)"
             params = (
                 self.dc_id,
@@ -185,5 +207,5 @@ class TeleSession:
                 self.auth_key,
                 self.takeout_id
             )
-            await db.execute(sql, params)
-            await db.commit()
+            db.execute(sql, params)
+            db.commit()
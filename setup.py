@@ -3,7 +3,7 @@ from setuptools import setup, find_packages
 with open("README.md", "r") as fh:
     long_description = fh.read()
 
-requirements = ["opentele", "aiosqlite", "pyrogram"]
+requirements = ["opentele", "pyrogram"]
 
 setup(
     name="TGConvertor",
@@ -21,6 +21,7 @@ setup(
     author_email="nazar.fedorowych@gmail.com",
     url="https://github.com/nazar220160/TGConvertor",
     requires=requirements,
+    extras_require={"speedups": ["pybase64"]},
     scripts=["TGConvertor/__main__.py"],
     classifiers=[
         "Programming Language :: Python :: 3.8",
@@ -0,0 +1,133 @@
+import asyncio
+
+from TGConvertor import SessionManager
+
+TEST_AUTH_KEY = b"a" * 256
+
+
+class FakeClient:
+    def __init__(self, fail_connect=False):
+        self.fail_connect = fail_connect
+        self.connected = False
+        self.connects = 0
+
+    def is_connected(self):
+        return self.connected
+
+    async def connect(self):
+        # The first connect is the slowest, so a context that enters while it
+        # is in progress finishes entering first.
+        self.connects += 1
+        for _ in range(3 if self.connects == 1 else 1):
+            await asyncio.sleep(0)
+        if self.fail_connect:
+            raise ConnectionError()
+        self.connected = True
+
+    async def disconnect(self):
+        self.connected = False
+
+
+def make_manager(*clients):
+    manager = SessionManager(dc_id=2, auth_key=TEST_AUTH_KEY)
+    clients = iter(clients)
+    manager.telethon_client = lambda: next(clients)
+    return manager
+
+
+def test_sm_nested_contexts_share_client():
+    async def run():
+        manager = make_manager(FakeClient())
+        async with manager as outer:
+            async with manager as inner:
+                assert inner is outer
+            assert outer.is_connected()
+        assert not outer.is_connected()
+        assert manager.client is None
+
+    asyncio.run(run())
+
+
+def test_sm_context_keeps_explicitly_opened_client():
+    async def run():
+        manager = make_manager(FakeClient())
+        client = await manager.open()
+        async with manager as entered:
+            assert entered is client
+        assert client.is_connected()
+        await manager.close()
+        assert manager.client is None
+
+    asyncio.run(run())
+
+
+def test_sm_failed_connect_does_not_leak_client():
+    async def run():
+        manager = make_manager(FakeClient(fail_connect=True), FakeClient())
+        try:
+            async with manager:
+                pass
+        except ConnectionError:
+            pass
+        assert manager.client is None
+
+        async with manager as client:
+            assert client.is_connected()
+        assert not client.is_connected()
+        assert manager.client is None
+
+    asyncio.run(run())
+
+
+def test_sm_overlapping_contexts_across_tasks():
+    async def run():
+        manager = make_manager(FakeClient())
+        outer_entered = asyncio.Event()
+        inner_exited = asyncio.Event()
+
+        async def outer():
+            async with manager as client:
+                outer_entered.set()
+                await inner_exited.wait()
+                assert client.is_connected()
+            return client
+
+        async def inner():
+            await outer_entered.wait()
+            async with manager as client:
+                pass
+            inner_exited.set()
+            return client
+
+        outer_client, inner_client = await asyncio.gather(outer(), inner())
+        assert outer_client is inner_client
+        assert not outer_client.is_connected()
+        assert manager.client is None
+
+    asyncio.run(run())
+
+
+def test_sm_concurrent_entry_keeps_client_for_remaining_context():
+    async def run():
+        manager = make_manager(FakeClient())
+        first_exited = asyncio.Event()
+
+        async def first():
+            async with manager as client:
+                pass
+            first_exited.set()
+            return client
+
+        async def second():
+            async with manager as client:
+                await first_exited.wait()
+                assert client.is_connected()
+            return client
+
+        first_client, second_client = await asyncio.gather(second(), first())
+        assert first_client is second_client
+        assert first_client.connects == 1
+        assert not first_client.is_connected()
+        assert manager.client is None
+
+    asyncio.run(run())
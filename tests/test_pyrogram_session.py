@@ -0,0 +1,33 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from TGConvertor.sessions.pyro import PyroSession
+
+TEST_AUTH_KEY = b"a" * 256
+
+
+def test_pyro_file_write_over_existing_session(tmp_path):
+    session_file = tmp_path / "test.session"
+    original = PyroSession(dc_id=2, auth_key=TEST_AUTH_KEY, user_id=12345)
+    asyncio.run(original.to_file(session_file))
+
+    other = PyroSession(dc_id=4, auth_key=b"b" * 256, user_id=54321)
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(other.to_file(session_file))
+
+    loaded = asyncio.run(PyroSession.from_file(session_file))
+    assert loaded.dc_id == original.dc_id
+    assert loaded.auth_key == original.auth_key
+    assert loaded.user_id == original.user_id
+
+
+def test_pyro_file_write_into_existing_empty_file(tmp_path):
+    session_file = tmp_path / "test.session"
+    session_file.touch()
+    original = PyroSession(dc_id=2, auth_key=TEST_AUTH_KEY, user_id=12345)
+    asyncio.run(original.to_file(session_file))
+
+    loaded = asyncio.run(PyroSession.from_file(session_file))
+    assert loaded.auth_key == original.auth_key
@@ -0,0 +1,44 @@
+import asyncio
+import sqlite3
+
+import pytest
+# Imported at collection time: pyrogram cannot be imported once asyncio.run
+# has left the thread without an event loop.
+from pyrogram.session.internals.data_center import DataCenter
+
+from TGConvertor.sessions.tele import TeleSession
+
+TEST_AUTH_KEY = b"a" * 256
+
+
+def test_tele_file_write_over_existing_session(tmp_path):
+    session_file = tmp_path / "test.session"
+    original = TeleSession(dc_id=2, auth_key=TEST_AUTH_KEY)
+    asyncio.run(original.to_file(session_file))
+
+    other = TeleSession(dc_id=4, auth_key=b"b" * 256)
+    with pytest.raises(sqlite3.OperationalError):
+        asyncio.run(other.to_file(session_file))
+
+    loaded = asyncio.run(TeleSession.from_file(session_file))
+    assert loaded.dc_id == original.dc_id
+    assert loaded.auth_key == original.auth_key
+    assert loaded.server_address == original.server_address
+
+
+def test_tele_file_write_into_existing_empty_file(tmp_path):
+    session_file = tmp_path / "test.session"
+    session_file.touch()
+    original = TeleSession(dc_id=2, auth_key=TEST_AUTH_KEY)
+    asyncio.run(original.to_file(session_file))
+
+    loaded = asyncio.run(TeleSession.from_file(session_file))
+    assert loaded.auth_key == original.auth_key
+
+
+def test_tele_dc_addresses_match_pyrogram():
+    assert TeleSession._DC_ADDRESSES.keys() == DataCenter.PROD.keys()
+    for dc_id, (server_address, port) in TeleSession._DC_ADDRESSES.items():
+        assert server_address == DataCenter.PROD[dc_id]
+        assert port == 443
+        assert (server_address, port) == DataCenter(dc_id, False, False, False)